@@ -14,6 +14,7 @@ Intended usage:
     response = ai.run("Explain the connection between gravity and entropy.")
 """
 
+import re
 import time
 import math
 from dataclasses import dataclass, field
@@ -48,6 +49,10 @@ class SledAIConfig:
     wake_level: float = 1e-5       # conceptual "birth" sensitivity
 
 
+# Lowercase word tokens used for answer-template dispatch
+_TOKEN_RE = re.compile(r"[a-z]+")
+
+
 # -------------------------------
 #  SledAI main class
 # -------------------------------
@@ -69,6 +74,14 @@ class SledAI:
             "computing_logic",
         ]
 
+        # Answer templates: each entry matches when, for every stem group,
+        # some question token starts with one of its stems
+        # ("stockholders", "marketplace" and "priced" all hit the market group).
+        self.answer_templates = [
+            ((("gravity",), ("entropy",)), self._render_gravity_entropy),
+            ((("stock", "market", "price"),), self._render_market),
+        ]
+
     # -------------------------------------------------
     #  Public entrypoint
     # -------------------------------------------------
@@ -330,27 +343,11 @@ class SledAI:
         - educational explanations
         """
 
-        q = question.lower()
-
-        # Example: gravity/entropy style answer
-        if "gravity" in q and "entropy" in q:
-            return (
-                "Gravity and entropy are linked through how matter, energy, and information organize themselves in spacetime.\n\n"
-                "- Entropy measures how many microscopic configurations a system can have.\n"
-                "- Gravity curves spacetime according to energy and mass.\n"
-                "- Black holes reveal the connection: their entropy is proportional to horizon area.\n"
-                "- Gravity shapes structure; entropy drives the arrow of time.\n\n"
-                "Together, they describe how the universe evolves."
-            )
-
-        # Example: markets/stock phrasing (compatible with your existing app)
-        if "stock" in q or "market" in q or "price" in q:
-            lines = []
-            lines.append("I will treat this as a market-structure and information-flow question, not just a price lookup.")
-            lines.append("First, I align on: the instrument, timeframe, and whether you're asking about behaviour, cause, or strategy.")
-            lines.append("Then I integrate: known economic context, basic microstructure, and any relevant patterns or anomalies.")
-            lines.append("I won't guess on unseen data; I will describe plausible mechanisms and what information would tighten them.")
-            return "\n\n".join(lines)
+        tokens = frozenset(_TOKEN_RE.findall(question.lower()))
+        for groups, render in self.answer_templates:
+            # str.startswith takes the whole stem tuple in one call
+            if all(any(t.startswith(stems) for t in tokens) for stems in groups):
+                return render(question, domains)
 
         # Fallback: structured, honest, domain-aware answer
         domain_labels = ", ".join(d.replace("_", " ") for d in domains)
@@ -364,6 +361,25 @@ class SledAI:
             "Tell me your preferred style, and I can specialise the explanation accordingly."
         )
 
+    def _render_gravity_entropy(self, question: str, domains: List[str]) -> str:
+        return (
+            "Gravity and entropy are linked through how matter, energy, and information organize themselves in spacetime.\n\n"
+            "- Entropy measures how many microscopic configurations a system can have.\n"
+            "- Gravity curves spacetime according to energy and mass.\n"
+            "- Black holes reveal the connection: their entropy is proportional to horizon area.\n"
+            "- Gravity shapes structure; entropy drives the arrow of time.\n\n"
+            "Together, they describe how the universe evolves."
+        )
+
+    def _render_market(self, question: str, domains: List[str]) -> str:
+        # Market-structure phrasing (compatible with your existing app)
+        lines = []
+        lines.append("I will treat this as a market-structure and information-flow question, not just a price lookup.")
+        lines.append("First, I align on: the instrument, timeframe, and whether you're asking about behaviour, cause, or strategy.")
+        lines.append("Then I integrate: known economic context, basic microstructure, and any relevant patterns or anomalies.")
+        lines.append("I won't guess on unseen data; I will describe plausible mechanisms and what information would tighten them.")
+        return "\n\n".join(lines)
+
     # -------------------------------------------------
     #  Helpers
     # -------------------------------------------------
@@ -0,0 +1 @@
+# Lets the tests import core/ and the top-level modules from the repo root.
@@ -0,0 +1,118 @@
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+from scipy.spatial import cKDTree
+
+# Annotation states
+BIRTH, SURVIVE, DIE = 0, 1, 2
+
+def pack_points(groups):
+    """
+    CSR-pack a list of (n, 2) cell arrays into (offsets, points).
+    """
+    offsets = np.zeros(len(groups) + 1, dtype=np.int32)
+    np.cumsum([len(g) for g in groups], out=offsets[1:])
+    if not groups:
+        return offsets, np.empty((0, 2), dtype=np.int16)
+    return offsets, np.concatenate(groups).astype(np.int16, copy=False)
+
+def empty_annotations():
+    return (np.empty(0, dtype=np.uint8),) + pack_points([])
+
+class BasinMemory:
+    """
+    Persistent Z-basin objects stored as parallel arrays.
+    Row k of ids / centroids / ages describes one object; its cells
+    are points[point_offsets[k]:point_offsets[k+1]] (CSR-packed).
+    """
+
+    def __init__(self):
+        self.ids = np.empty(0, dtype=np.int64)
+        self.centroids = np.empty((0, 2), dtype=np.float32)
+        self.ages = np.empty(0, dtype=np.int32)
+        self.point_offsets, self.points = pack_points([])
+        self.next_id = 0
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def max_age(self):
+        return int(self.ages.max(initial=0))
+
+    def update(self, basins, centroids, match_dist):
+        """
+        Match current basins to remembered objects by centroid distance.
+        Matching is one-to-one and globally optimal (Hungarian); pairs
+        further apart than match_dist never match, so only KD-tree
+        range candidates are ever costed.
+        Returns annotations (states, offsets, points): one uint8 state
+        (BIRTH / SURVIVE / DIE) per object, cells CSR-packed.
+        """
+        centroids = np.asarray(centroids, dtype=np.float32).reshape(-1, 2)
+        n_prev, n_cur = len(self.ids), len(centroids)
+
+        rows = np.empty(0, dtype=np.int64)
+        cols = np.empty(0, dtype=np.int64)
+        if n_prev and n_cur:
+            # Candidate pairs from a KD-tree range query; only objects with
+            # a basin in range enter the (now much smaller) assignment
+            pairs = cKDTree(self.centroids).sparse_distance_matrix(
+                cKDTree(centroids), match_dist * (1 + 1e-9), output_type="ndarray"
+            )
+            if len(pairs):
+                pi, ci = pairs["i"], pairs["j"]
+                dx = self.centroids[pi, 0].astype(np.float64) - centroids[ci, 0]
+                dy = self.centroids[pi, 1].astype(np.float64) - centroids[ci, 1]
+                d2 = dx * dx + dy * dy
+                limit = match_dist * match_dist
+                ok = d2 <= limit
+                pi, ci, d2 = pi[ok], ci[ok], d2[ok]
+
+                urows, ri = np.unique(pi, return_inverse=True)
+                ucols, cj = np.unique(ci, return_inverse=True)
+                if len(urows) == len(ucols) == len(pi):
+                    # Every candidate pair is exclusive: nothing to solve
+                    rows, cols = pi, ci
+                else:
+                    # Out-of-range pairs cost more than any full set of
+                    # in-range pairs, so the solver maximises matches first.
+                    blocked = limit * (min(len(urows), len(ucols)) + 1) + 1.0
+                    cost = np.full((len(urows), len(ucols)), blocked)
+                    cost[ri, cj] = d2
+                    r, c = linear_sum_assignment(cost)
+                    ok = cost[r, c] <= limit
+                    rows, cols = urows[r[ok]], ucols[c[ok]]
+
+        prev_of = np.full(n_cur, -1, dtype=np.int64)
+        prev_of[cols] = rows
+
+        # SURVIVE / BIRTH per current basin, then DEATHS
+        dead = np.ones(n_prev, dtype=bool)
+        dead[rows] = False
+
+        states = np.concatenate([
+            np.where(prev_of >= 0, SURVIVE, BIRTH),
+            np.full(dead.sum(), DIE),
+        ]).astype(np.uint8)
+        # Dead objects' cells in one masked gather from the packed points
+        sizes = np.diff(self.point_offsets)
+        dead_cells = self.points[np.repeat(dead, sizes)]
+        offsets = np.zeros(len(states) + 1, dtype=np.int32)
+        np.cumsum([len(b) for b in basins] + sizes[dead].tolist(), out=offsets[1:])
+        points = np.concatenate(list(basins) + [dead_cells]).astype(np.int16, copy=False)
+        annotations = (states, offsets, points)
+
+        kept = np.flatnonzero(prev_of >= 0)
+        born = np.flatnonzero(prev_of < 0)
+        survivors = prev_of[kept]
+
+        new_ids = np.arange(self.next_id, self.next_id + len(born), dtype=np.int64)
+        self.next_id += len(born)
+
+        order = np.concatenate([kept, born])
+        self.ids = np.concatenate([self.ids[survivors], new_ids])
+        self.ages = np.concatenate([self.ages[survivors] + 1, np.ones(len(born), dtype=np.int32)])
+        self.centroids = centroids[order]
+        self.point_offsets, self.points = pack_points([basins[b] for b in order])
+
+        return annotations
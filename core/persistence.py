@@ -1,12 +1,21 @@
 import numpy as np
 
 class Persistence:
-    def __init__(self, size):
-        self.map = np.zeros((size, size))
+    def __init__(self, size, dtype=np.float32):
+        self.map = np.zeros((size, size), dtype=dtype)
+        self.last = None
+        self.delta = np.empty((size, size), dtype=dtype)
+        self.still = np.empty((size, size), dtype=bool)
 
     def update(self, grid, threshold=0.02):
-        delta = np.abs(grid - getattr(self, "last", grid))
-        self.map[delta < threshold] += 1
-        self.map[delta >= threshold] = 0
-        self.last = grid.copy()
+        if self.last is None:
+            self.last = grid.copy()
+        delta = np.subtract(grid, self.last, out=self.delta)
+        np.abs(delta, out=delta)
+        # Count up where the cell held still, reset to 0 where it moved:
+        # map = (map + 1) * still, entirely in preallocated buffers
+        still = np.less(delta, threshold, out=self.still)
+        self.map += 1
+        self.map *= still
+        np.copyto(self.last, grid)
         return self.map
\ No newline at end of file
@@ -1,51 +1,78 @@
 import numpy as np
+from scipy.spatial import cKDTree
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
 
 def cluster_reaction_points(RP_coords, eps=2.5, min_samples=3):
     """
     Physics-first clustering of Reaction Points.
     No ML, no sklearn.
 
-    RP_coords: list of (row, col)
+    RP_coords: (N, 2) array (or list) of (row, col)
     eps: spatial radius
     min_samples: minimum points to form a proto-object
+
+    Returns CSR-packed clusters (offsets, rows, cols): cluster k is
+    rows[offsets[k]:offsets[k+1]], cols[offsets[k]:offsets[k+1]].
+
+    A point with at least min_samples points within eps (itself
+    included) is a core point. Core points closer than eps chain into
+    one proto-object, which also takes every point within eps of its
+    cores. Neighbourhoods come from one spatial-tree query and chains
+    from one connected-components pass, instead of re-scanning all
+    points per grown member.
     """
 
     if len(RP_coords) == 0:
-        return []
-
-    RP = np.array(RP_coords)
-    used = np.zeros(len(RP), dtype=bool)
-    clusters = []
+        return _empty_clusters()
 
-    for i in range(len(RP)):
-        if used[i]:
-            continue
+    RP = np.asarray(RP_coords)
+    n = len(RP)
 
-        # Find neighbours within radius
-        dists = np.linalg.norm(RP - RP[i], axis=1)
-        neighbours = np.where(dists <= eps)[0]
+    pairs = cKDTree(RP).query_pairs(eps, output_type="ndarray")
+    core = np.bincount(pairs.ravel(), minlength=n) + 1 >= min_samples
+    core_idx = np.flatnonzero(core)
+    if len(core_idx) == 0:
+        return _empty_clusters()
 
-        if len(neighbours) < min_samples:
-            continue
+    # Chain core points
+    a, b = pairs[:, 0], pairs[:, 1]
+    link = core[a] & core[b]
+    graph = coo_matrix(
+        (np.ones(link.sum(), dtype=np.int8), (a[link], b[link])), shape=(n, n)
+    )
+    _, comp = connected_components(graph, directed=False)
 
-        # Grow cluster
-        cluster = set(neighbours.tolist())
-        changed = True
+    # Border points attach to every proto-object whose core reaches them
+    edge = core[a] != core[b]
+    core_end = np.where(core[a[edge]], a[edge], b[edge])
+    border_end = np.where(core[a[edge]], b[edge], a[edge])
+    border_comp = comp[core_end]
 
-        while changed:
-            changed = False
-            for idx in list(cluster):
-                dists = np.linalg.norm(RP - RP[idx], axis=1)
-                new = set(np.where(dists <= eps)[0])
-                if len(new) >= min_samples:
-                    if not new.issubset(cluster):
-                        cluster |= new
-                        changed = True
+    # Proto-objects numbered in order of their lowest core point
+    core_comp = comp[core_idx]
+    roots, first = np.unique(core_comp, return_index=True)
+    rank = np.empty(n, dtype=np.int64)
+    rank[roots[np.argsort(first)]] = np.arange(len(roots))
 
-        cluster = list(cluster)
-        for idx in cluster:
-            used[idx] = True
+    # (object, point) memberships, deduplicated and grouped by object
+    member = np.unique(
+        np.concatenate([
+            np.column_stack((rank[core_comp], core_idx)),
+            np.column_stack((rank[border_comp], border_end)),
+        ]),
+        axis=0,
+    )
+    counts = np.bincount(member[:, 0], minlength=len(roots))
+    offsets = np.zeros(len(roots) + 1, dtype=np.int32)
+    np.cumsum(counts, out=offsets[1:])
 
-        clusters.append(RP[cluster])
+    pts = RP[member[:, 1]]
+    return offsets, pts[:, 0].astype(np.int16), pts[:, 1].astype(np.int16)
 
-    return clusters
\ No newline at end of file
+def _empty_clusters():
+    return (
+        np.zeros(1, dtype=np.int32),
+        np.empty(0, dtype=np.int16),
+        np.empty(0, dtype=np.int16),
+    )
@@ -10,8 +10,39 @@ def compute_Sigma(grid, prev_grid):
     Sigma = np.abs(grid - prev_grid)
     return Sigma
 
+def compute_Z_Sigma(grid, prev_grid, persistence):
+    # Z and Sigma in one pass, each built in place in its own array.
+    # Same values as compute_Z / compute_Sigma, no temporaries.
+    # Float32 at least, even for integer / uint8 grids
+    dtype = np.result_type(grid.dtype, np.float32)
+    Z = np.empty(grid.shape, dtype=dtype)
+    Sigma = np.empty(grid.shape, dtype=dtype)
+
+    # Rigidity term, using the Sigma array as scratch
+    np.divide(persistence, persistence.max() + 1e-6, out=Sigma)
+    np.subtract(grid, grid.mean(), out=Z)
+    np.abs(Z, out=Z)
+    Z += Sigma
+    np.clip(Z, 0, 1, out=Z)
+
+    np.subtract(grid, prev_grid, out=Sigma, dtype=dtype)
+    np.abs(Sigma, out=Sigma)
+    return Z, Sigma
+
 def detect_RP(Z, Sigma, z_thresh=0.4, s_thresh=0.15):
-    return np.where((Z > z_thresh) & (Sigma > s_thresh))
+    # Both thresholds fold into one bool buffer; the hits come back
+    # as (rows, cols), the same shape np.where would give, in int16
+    # whenever the grid is small enough for it to hold every index.
+    mask = np.greater(Z, z_thresh)
+    mask &= np.greater(Sigma, s_thresh)
+    rows, cols = np.divmod(np.flatnonzero(mask), Z.shape[1])
+    dtype = np.int16 if max(Z.shape) <= np.iinfo(np.int16).max + 1 else np.intp
+    return rows.astype(dtype), cols.astype(dtype)
+
+def compute_frame(grid, prev_grid, persistence, z_thresh=0.4, s_thresh=0.15):
+    # Z, Sigma and Reaction Points in one call
+    Z, Sigma = compute_Z_Sigma(grid, prev_grid, persistence)
+    return Z, Sigma, detect_RP(Z, Sigma, z_thresh, s_thresh)
 
 def compute_T_info(Z, Sigma):
     T = np.zeros_like(Z)
@@ -1,25 +1,51 @@
+import functools
 import numpy as np
 
+# Structural crowding kernel (3x3, wrap-around)
+KERNEL = np.array([[0.05, 0.1, 0.05],
+                   [0.1,  0.4, 0.1 ],
+                   [0.05, 0.1, 0.05]])
+
+@functools.lru_cache(maxsize=16)
+def _wrap_index(size):
+    # Index of a 1-cell wrap padding, built once per grid size
+    idx = np.r_[size - 1, 0:size, 0]
+    idx.flags.writeable = False
+    return idx
+
 class Square:
-    def __init__(self, size=32, noise=0.02):
+    def __init__(self, size=32, noise=0.02, dtype=np.float32):
         self.size = size
-        self.grid = np.random.rand(size, size)
         self.noise = noise
 
+        # Two-slot frame ring: step() writes the back slot, then flips
+        self.frames = np.empty((2, size, size), dtype=dtype)
+        self.cur = 0
+        self.frames[0] = np.random.rand(size, size)
+        self.grid = self.frames[0]
+        # Kernel in the grid's own dtype: no mixed-precision taps
+        self.kernel = KERNEL.astype(dtype)
+
     def step(self):
-        # Structural crowding update (no time semantics)
-        kernel = np.array([[0.05, 0.1, 0.05],
-                           [0.1,  0.4, 0.1 ],
-                           [0.05, 0.1, 0.05]])
-        padded = np.pad(self.grid, 1, mode="wrap")
-        new = np.zeros_like(self.grid)
-
-        for i in range(self.size):
-            for j in range(self.size):
-                patch = padded[i:i+3, j:j+3]
-                new[i, j] = np.sum(patch * kernel)
-
-        self.grid = new + np.random.normal(0, self.noise, self.grid.shape)
-        self.grid = np.clip(self.grid, 0, 1)
-
-        return self.grid
\ No newline at end of file
+        """
+        Structural crowding update (no time semantics).
+        Returns self.grid, which is a view into the two-slot frame ring:
+        the step after next writes over it. Copy the result to keep it.
+        """
+        n = self.size
+        w = _wrap_index(n)
+        padded = self.grid[np.ix_(w, w)]
+        new = self.frames[self.cur ^ 1]
+        new.fill(0.0)
+
+        # One shifted window per kernel tap instead of one patch per cell
+        for di in range(3):
+            for dj in range(3):
+                new += self.kernel[di, dj] * padded[di:di+n, dj:dj+n]
+
+        new += np.random.normal(0, self.noise, new.shape)
+        np.clip(new, 0, 1, out=new)
+
+        self.cur ^= 1
+        self.grid = new
+        return self.grid
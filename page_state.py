@@ -0,0 +1,36 @@
+from collections import deque
+
+import streamlit as st
+
+# ==================================================
+# SESSION LOGS
+# ==================================================
+LOG_CAP = 500
+
+def init_logs(*keys):
+    """
+    Create any missing session log. Logs are newest first and capped:
+    appendleft is O(1) and the oldest entries fall off.
+    """
+    for key in keys:
+        if key not in st.session_state:
+            st.session_state[key] = deque(maxlen=LOG_CAP)
+
+# ==================================================
+# SESSION FIGURES
+# ==================================================
+def session_figure(key, figsize):
+    """
+    (fig, ax) for one panel, kept in this session and cleared on each
+    call, rather than a new pyplot figure that stays alive until closed.
+    """
+    if key not in st.session_state:
+        # Imported here so pages without plots never load matplotlib
+        from matplotlib.figure import Figure
+        fig = Figure(figsize=figsize)
+        fig.add_subplot()
+        st.session_state[key] = fig
+    fig = st.session_state[key]
+    ax = fig.axes[0]
+    ax.clear()
+    return fig, ax
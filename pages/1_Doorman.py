@@ -2,12 +2,13 @@ import streamlit as st
 import uuid
 from datetime import datetime
 
+from page_state import init_logs
+
 st.set_page_config(page_title="Doorman", layout="wide")
 st.title("🚪 Doorman")
 st.caption("All inputs require a Ticker/ID for room allocation & coupling")
 
-if "inputs_log" not in st.session_state:
-    st.session_state.inputs_log = []
+init_logs("inputs_log")
 
 ticker = st.text_input("Ticker/ID (required)", "").upper().strip()
 text_input = st.text_area("Text Input", height=160)
@@ -38,7 +39,7 @@ if st.button("Process Input"):
             "Preview": content[:120],
             "Raw": content,
         }
-        st.session_state.inputs_log.insert(0, entry)
+        st.session_state.inputs_log.appendleft(entry)
         st.success("Input accepted")
         st.code(tx_code)
 
@@ -1,29 +1,69 @@
 import streamlit as st
+import pyarrow as pa
+import re
 import uuid
+from itertools import takewhile
 from datetime import datetime
 
+from page_state import LOG_CAP, init_logs
+
 st.set_page_config(page_title="Concierge", layout="wide")
 st.title("🛎 Concierge")
 st.caption("Classifies inputs • creates room IDs • routes actions")
 
-for key in ["inputs_log", "concierge_log"]:
-    if key not in st.session_state:
-        st.session_state[key] = []
+init_logs("inputs_log", "concierge_log")
+
+def _any_of(words):
+    # One compiled alternation per rule instead of a substring scan per word
+    return re.compile("|".join(map(re.escape, words)), re.IGNORECASE)
+
+_SALES_RE = _any_of(["buy","sell","stock","share","ticker","price","earnings","guidance"])
+_REPLY_RE = _any_of(["reply","respond","urgent","asap","?"])
+_SYSTEM_RE = _any_of(["error","alert","system"])
 
 def classify(text: str):
-    t = (text or "").lower()
-    if any(w in t for w in ["buy","sell","stock","share","ticker","price","earnings","guidance"]):
+    t = text or ""
+    if _SALES_RE.search(t):
         return "SALES_MARKETING", "ROUTE_TO_SALES"
-    if any(w in t for w in ["reply","respond","urgent","asap","?"]):
+    if _REPLY_RE.search(t):
         return "REQUIRES_REPLY", "REVIEW"
-    if any(w in t for w in ["error","alert","system"]):
+    if _SYSTEM_RE.search(t):
         return "SYSTEM_SIGNAL", "ESCALATE_MANAGER"
     if len(t.strip()) < 20:
         return "INFORMATION_ONLY", "NONE"
     return "UNKNOWN", "REVIEW"
 
-processed = {c["Transaction_Code"] for c in st.session_state.concierge_log}
-new_items = [i for i in st.session_state.inputs_log if i["Transaction_Code"] not in processed]
+REGISTER_SCHEMA = pa.schema([(c, pa.string()) for c in (
+    "Timestamp", "Transaction_Code", "Ticker", "Category",
+    "Action_Required", "Room_ID", "Preview", "Signal",
+)])
+
+def register_table():
+    # Columnar copy of the register, kept across reruns. New entries sit
+    # at the front of the log, so only that prefix is converted and
+    # stacked on the existing table; unchanged reruns convert nothing.
+    log = st.session_state.concierge_log
+    tbl = st.session_state.get("concierge_tbl")
+    if tbl is None:
+        tbl = pa.Table.from_pylist(list(log), schema=REGISTER_SCHEMA)
+    else:
+        head = tbl["Transaction_Code"][0].as_py() if tbl.num_rows else None
+        new = list(takewhile(lambda e: e["Transaction_Code"] != head, log))
+        if new:
+            tbl = pa.concat_tables([
+                pa.Table.from_pylist(new, schema=REGISTER_SCHEMA), tbl
+            ]).slice(0, len(log))
+    st.session_state.concierge_tbl = tbl
+    return tbl
+
+# Codes already routed, kept across reruns and grown as items are processed
+if "concierge_seen" not in st.session_state:
+    st.session_state.concierge_seen = {c["Transaction_Code"] for c in st.session_state.concierge_log}
+seen = st.session_state.concierge_seen
+
+# inputs_log is newest first and every run routes all arrivals, so the
+# new items are the prefix before the first code already seen
+new_items = list(takewhile(lambda i: i["Transaction_Code"] not in seen, st.session_state.inputs_log))
 
 if st.button("Process New Arrivals"):
     n = 0
@@ -39,14 +79,20 @@ if st.button("Process New Arrivals"):
             "Preview": item["Preview"],
             "Signal": item.get("Signal",""),
         }
-        st.session_state.concierge_log.insert(0, entry)
+        st.session_state.concierge_log.appendleft(entry)
+        seen.add(item["Transaction_Code"])
         n += 1
+    # Codes older than the capped log can never stop the scan again, so
+    # once seen holds twice the cap, rebuild it from what the log keeps
+    if len(seen) > 2 * LOG_CAP:
+        seen = {c["Transaction_Code"] for c in st.session_state.concierge_log}
+        st.session_state.concierge_seen = seen
     st.success(f"Processed {n} input(s).")
 
 st.markdown("---")
 st.subheader("Concierge Register")
 if st.session_state.concierge_log:
-    st.dataframe(st.session_state.concierge_log, use_container_width=True)
+    st.dataframe(register_table(), use_container_width=True, hide_index=True)
 else:
     st.caption("No concierge entries yet.")
 
@@ -1,9 +1,15 @@
 import streamlit as st
 from datetime import datetime
+import heapq
 import re
+import sys
+import numpy as np
 import pandas as pd
 import networkx as nx
-import matplotlib.pyplot as plt
+from scipy import sparse
+from matplotlib.collections import LineCollection
+
+from page_state import session_figure
 
 st.set_page_config(page_title="Reception", layout="wide")
 st.title("🏨 Reception")
@@ -19,22 +25,40 @@ for key in ["rooms_log", "couplings_log"]:
 # ==================================================
 # KEYWORD EXTRACTION
 # ==================================================
+_WORD_RE = re.compile(r"[a-z]{4,}")
+
+STOP_WORDS = frozenset({
+    "this","that","with","from","have","will","your","into","they","them",
+    "when","what","also","just","more","news","scan","sled","price","signal"
+})
+
 def keywords(text: str):
-    words = re.findall(r"[a-zA-Z]{4,}", (text or "").lower())
-    stop = {
-        "this","that","with","from","have","will","your","into","they","them",
-        "when","what","also","just","more","news","scan","sled","price","signal"
-    }
-    return set(w for w in words if w not in stop)
+    # Interned tokens: rooms share one string object per word, and the
+    # coupling intersections compare by identity before equality
+    return frozenset(map(sys.intern, _WORD_RE.findall((text or "").lower()))) - STOP_WORDS
+
+ROOM_COLS = ["Timestamp", "Room_ID", "Ticker", "Status", "Preview"]
+
+COUPLING_COLS = [
+    "Ticker_A", "Room_A", "Ticker_B", "Room_B", "Strength", "Overlap", "Keywords",
+]
 
 # ==================================================
 # ROOM NORMALISATION (SAFE)
 # ==================================================
 def normalise_rooms():
+    # The list we produced last time is already clean. Another pass is
+    # needed when a page has replaced it or appended to it in place;
+    # rooms normalised before keep their _kw, so the pass stays cheap
+    rooms = st.session_state.rooms_log
+    last, size = st.session_state.get("rooms_clean", (None, -1))
+    if last is rooms and size == len(rooms):
+        return
+
     seen = set()
     clean = []
 
-    for r in st.session_state.rooms_log:
+    for r in rooms:
         key = r.get("Room_ID") or r.get("Ticker")
         if not key or key in seen:
             continue
@@ -46,10 +70,12 @@ def normalise_rooms():
             "Ticker": (r.get("Ticker") or "").upper(),
             "Status": r.get("Status", "IN_HOUSE"),
             "Preview": r.get("Preview", ""),
-            "_kw": keywords(r.get("Preview",""))
+            # Tokenised once per room; later reruns reuse the set
+            "_kw": r["_kw"] if "_kw" in r else keywords(r.get("Preview",""))
         })
 
     st.session_state.rooms_log = clean
+    st.session_state.rooms_clean = (clean, len(clean))
 
 normalise_rooms()
 
@@ -60,30 +86,42 @@ def compute_couplings():
     rooms = st.session_state.rooms_log
     couplings = []
 
-    for i in range(len(rooms)):
-        for j in range(i + 1, len(rooms)):
-            A = rooms[i]["_kw"]
-            B = rooms[j]["_kw"]
-            inter = A & B
-
-            if len(inter) >= 7:
-                strength = "FULLY_COUPLED"
-            elif len(inter) >= 4:
-                strength = "STRONGLY_COUPLED"
-            elif len(inter) >= 2:
-                strength = "POTENTIAL"
-            else:
-                continue
-
-            couplings.append({
-                "Ticker_A": rooms[i]["Ticker"],
-                "Room_A": rooms[i]["Room_ID"],
-                "Ticker_B": rooms[j]["Ticker"],
-                "Room_B": rooms[j]["Room_ID"],
-                "Strength": strength,
-                "Overlap": len(inter),
-                "Keywords": ", ".join(sorted(list(inter))[:8]),
-            })
+    # Binary room x keyword matrix; X @ X.T counts shared keywords for
+    # every pair in one sparse product instead of a set per pair
+    vocab = {}
+    cols = [[vocab.setdefault(w, len(vocab)) for w in r["_kw"]] for r in rooms]
+    indptr = np.cumsum([0] + [len(c) for c in cols])
+    X = sparse.csr_matrix(
+        (np.ones(indptr[-1], dtype=np.int32),
+         np.array([k for c in cols for k in c], dtype=np.int32),
+         indptr),
+        shape=(len(rooms), len(vocab)),
+    )
+    overlap = sparse.triu(X @ X.T, k=1).tocoo()
+
+    keep = overlap.data >= 2
+    pi, pj, n = overlap.row[keep], overlap.col[keep], overlap.data[keep]
+    order = np.lexsort((pj, pi))
+
+    for i, j, size in zip(pi[order], pj[order], n[order]):
+        if size >= 7:
+            strength = "FULLY_COUPLED"
+        elif size >= 4:
+            strength = "STRONGLY_COUPLED"
+        else:
+            strength = "POTENTIAL"
+
+        inter = rooms[i]["_kw"] & rooms[j]["_kw"]
+        couplings.append({
+            "Ticker_A": rooms[i]["Ticker"],
+            "Room_A": rooms[i]["Room_ID"],
+            "Ticker_B": rooms[j]["Ticker"],
+            "Room_B": rooms[j]["Room_ID"],
+            "Strength": strength,
+            "Overlap": int(size),
+            # First eight keywords alphabetically, without sorting them all
+            "Keywords": ", ".join(heapq.nsmallest(8, inter)),
+        })
 
     return couplings
 
@@ -99,8 +137,11 @@ st.markdown("---")
 st.subheader("🏨 Rooms In-House")
 
 if st.session_state.rooms_log:
-    view = [{k:v for k,v in r.items() if not k.startswith("_")} for r in st.session_state.rooms_log]
-    st.dataframe(pd.DataFrame(view), use_container_width=True)
+    # Fixed columns: pandas skips key inference and the private _kw field
+    st.dataframe(
+        pd.DataFrame.from_records(st.session_state.rooms_log, columns=ROOM_COLS),
+        use_container_width=True,
+    )
 else:
     st.caption("No rooms available.")
 
@@ -110,7 +151,10 @@ else:
 st.subheader("🔗 Couplings")
 
 if st.session_state.couplings_log:
-    st.dataframe(pd.DataFrame(st.session_state.couplings_log), use_container_width=True)
+    st.dataframe(
+        pd.DataFrame.from_records(st.session_state.couplings_log, columns=COUPLING_COLS),
+        use_container_width=True,
+    )
 else:
     st.caption("No couplings computed yet.")
 
@@ -119,35 +163,63 @@ st.markdown("---")
 # ==================================================
 # NETWORK GRAPH
 # ==================================================
+@st.cache_data(show_spinner=False, max_entries=8)
+def coupling_layout(nodes, edges):
+    # Spring layout keyed on the graph itself: reruns with unchanged
+    # couplings skip the force iterations. Node order is passed through
+    # so the seeded layout matches the graph it was built from.
+    G = nx.Graph()
+    G.add_nodes_from(nodes)
+    G.add_weighted_edges_from(edges)
+    return nx.spring_layout(G, seed=42, k=0.7)
+
 st.subheader("🕸 Coupling Network")
 
 if not st.session_state.couplings_log:
     st.caption("No couplings to display.")
 else:
-    G = nx.Graph()
-
     rank = {"POTENTIAL":1, "STRONGLY_COUPLED":2, "FULLY_COUPLED":3}
-
-    for c in st.session_state.couplings_log:
-        a, b = c["Ticker_A"], c["Ticker_B"]
-        w = rank[c["Strength"]]
-        if G.has_edge(a, b):
-            G[a][b]["weight"] += w
-        else:
-            G.add_edge(a, b, weight=w)
-
-    pos = nx.spring_layout(G, seed=42, k=0.7)
-
-    deg = dict(G.degree())
-    node_sizes = [400 + deg[n]*240 for n in G.nodes()]
-    edge_widths = [1.4 + G[u][v]["weight"] for u,v in G.edges()]
-
-    fig, ax = plt.subplots(figsize=(11,7))
+    log = st.session_state.couplings_log
+
+    # Ticker ids in first-appearance order (keeps the seeded layout stable)
+    ends = np.array([[c["Ticker_A"], c["Ticker_B"]] for c in log])
+    names, first, inv = np.unique(ends.ravel(), return_index=True, return_inverse=True)
+    order = np.argsort(first)
+    rid = np.empty_like(order)
+    rid[order] = np.arange(len(order))
+    idx = rid[inv].reshape(-1, 2)
+
+    # Weighted adjacency in one sparse build; repeated pairs sum their rank
+    n = len(names)
+    w = np.array([rank[c["Strength"]] for c in log])
+    U = sparse.coo_matrix((w, (idx.min(axis=1), idx.max(axis=1))), shape=(n, n)).tocsr()
+    A = (U + sparse.triu(U, k=1).T).tocsr()
+    labels = names[order].tolist()
+
+    E = U.tocoo()
+    pos = coupling_layout(
+        tuple(labels),
+        tuple((labels[i], labels[j], wt) for i, j, wt in zip(E.row.tolist(), E.col.tolist(), E.data.tolist())),
+    )
+    xy = np.array([pos[t] for t in labels])
+
+    # Degree per node from the row lengths; a self-loop counts twice
+    deg = np.diff(A.indptr) + (A.diagonal() != 0)
+    node_sizes = 400 + deg * 240
+    edge_widths = 1.4 + E.data
+
+    fig, ax = session_figure("net_fig", (11,7))
     ax.axis("off")
 
-    nx.draw_networkx_nodes(G, pos, node_size=node_sizes, ax=ax)
-    nx.draw_networkx_edges(G, pos, width=edge_widths, alpha=0.7, ax=ax)
-    nx.draw_networkx_labels(G, pos, font_size=9, ax=ax)
+    # Whole network as one line collection and one scatter instead of
+    # an artist per edge and node
+    ax.add_collection(LineCollection(
+        np.stack([xy[E.row], xy[E.col]], axis=1),
+        linewidths=edge_widths, colors="k", alpha=0.7, zorder=1,
+    ))
+    ax.scatter(xy[:, 0], xy[:, 1], s=node_sizes, zorder=2)
+    for t, (x, y) in zip(labels, xy):
+        ax.text(x, y, t, fontsize=9, ha="center", va="center", zorder=3)
 
     ax.set_title("Ticker Coupling Network")
     st.pyplot(fig, use_container_width=True)
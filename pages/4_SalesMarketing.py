@@ -1,19 +1,49 @@
 import streamlit as st
 import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 import pandas as pd
 
-from sled_core import safe_history, safe_news, SLEDEngine
+from sled_core import safe_summary, safe_summaries, safe_news, SLEDEngine
+from page_state import init_logs
 
 st.set_page_config(page_title="Sales & Marketing", layout="wide")
 st.title("📈 Sales & Marketing — Full SLED + News")
 st.caption("Scans market + pulls relevant news per ticker/room")
 
-for key in ["inputs_log", "sales_last_scan", "rooms_log"]:
+for key in ["sales_last_scan", "rooms_log"]:
     if key not in st.session_state:
         st.session_state[key] = []
 
-engine = SLEDEngine(window=20, lookback=100, entropy_bins=10)
+init_logs("inputs_log")
+
+@st.cache_resource
+def get_engine():
+    # One engine per process; it is stateless across calls
+    return SLEDEngine(window=20, lookback=100, entropy_bins=10)
+
+@st.cache_resource
+def get_pool():
+    # One fetch pool per process, shared by scans and news pulls across
+    # sessions: no thread start-up per click, and a single bound on how
+    # many requests hit the data provider at once
+    return ThreadPoolExecutor(max_workers=16)
+
+engine = get_engine()
+pool = get_pool()
+
+def fetch_all(status, fn, tickers):
+    """
+    Run fn over tickers on the pool, ticking each one off in the status
+    box as it lands. Results come back in ticker order.
+    """
+    futs = {pool.submit(fn, t): i for i, t in enumerate(tickers)}
+    out = [None] * len(tickers)
+    for fut in as_completed(futs):
+        i = futs[fut]
+        out[i] = fut.result()
+        status.write(f"{'✓' if out[i] else '·'} {tickers[i]}")
+    return out
 
 DEFAULT_UNIVERSE = [
     # Tech
@@ -32,6 +62,10 @@ DEFAULT_UNIVERSE = [
     "SPY","QQQ","DIA"
 ]
 
+SCAN_COLS = [
+    "Ticker","Signal","Price","RiseScore_14d","Gate","Sigma","Z_Trap","Bullseye_BUY","Bullseye_SELL"
+]
+
 st.subheader("📦 Universe")
 universe_text = st.text_area("Tickers (comma-separated)", ", ".join(DEFAULT_UNIVERSE), height=70)
 UNIVERSE = [t.strip().upper() for t in universe_text.split(",") if t.strip()]
@@ -45,17 +79,22 @@ with c2:
     run_news = st.button("📰 Pull News for In-House Rooms")
 
 if run_scan:
-    results = []
-    for t in UNIVERSE:
-        df = safe_history(t, lookback)
-        if df is None:
-            continue
+    with st.status("Scanning universe…", expanded=True) as status:
+        # One batched download for the universe; tickers it could not
+        # serve are retried one by one on the pool
+        status.write(f"Batched download: {len(UNIVERSE)} tickers")
+        summaries = safe_summaries(UNIVERSE, lookback, engine)
+        missing = [t for t, s in zip(UNIVERSE, summaries) if s is None]
+        if missing:
+            status.write(f"Retrying {len(missing)} individually")
+        retried = dict(zip(missing, fetch_all(
+            status, lambda t: safe_summary(t, lookback, engine), missing
+        )))
+        summaries = [s if s is not None else retried[t] for t, s in zip(UNIVERSE, summaries)]
+        status.update(label="Scan finished", state="complete", expanded=False)
 
-        dfp = engine.calculate(df)
-        if dfp is None:
-            continue
-
-        summary = engine.summarize(dfp)
+    results = []
+    for t, summary in zip(UNIVERSE, summaries):
         if not summary:
             continue
 
@@ -76,15 +115,15 @@ if run_scan:
             **summary
         }
 
-        st.session_state.inputs_log.insert(0, entry)
+        st.session_state.inputs_log.appendleft(entry)
         results.append(entry)
 
     st.session_state.sales_last_scan = results
 
     st.success(f"Full scan complete: {len(results)} tickers")
-    df_out = pd.DataFrame(results).sort_values("RiseScore_14d", ascending=False)
+    df_out = pd.DataFrame.from_records(results, columns=SCAN_COLS)
     st.dataframe(
-        df_out[["Ticker","Signal","Price","RiseScore_14d","Gate","Sigma","Z_Trap","Bullseye_BUY","Bullseye_SELL"]],
+        df_out.sort_values("RiseScore_14d", ascending=False),
         use_container_width=True
     )
 
@@ -94,9 +133,13 @@ if run_news:
     if not tickers_in_house:
         st.warning("No in-house rooms/tickers yet. Allocate rooms first.")
     else:
+        # News fetches are independent and cached per ticker: overlap them
+        with st.status("Pulling news…", expanded=True) as status:
+            news = fetch_all(status, lambda t: safe_news(t, limit=6), tickers_in_house)
+            status.update(label="News pulled", state="complete", expanded=False)
+
         injected = 0
-        for t in tickers_in_house:
-            items = safe_news(t, limit=6)
+        for t, items in zip(tickers_in_house, news):
             if not items:
                 continue
 
@@ -113,7 +156,7 @@ if run_news:
                 "Preview": content[:120],
                 "Raw": content
             }
-            st.session_state.inputs_log.insert(0, entry)
+            st.session_state.inputs_log.appendleft(entry)
             injected += 1
 
         st.success(f"Injected news inputs: {injected}")
@@ -1,10 +1,12 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
+from collections import Counter
 from datetime import datetime
+from itertools import islice
 
 from sled_core import safe_history
+from page_state import init_logs, session_figure
 
 st.set_page_config(page_title="Accounts", layout="wide")
 st.title("💰 Accounts — Portfolio (Paper + Coupling + SLED)")
@@ -13,10 +15,12 @@ st.caption("Acts on: Bullseye OR Strong Coupling • Direction from SLED Signal
 # ==================================================
 # STATE
 # ==================================================
-for key in ["portfolio", "trade_log", "sales_last_scan", "couplings_log", "inputs_log", "rooms_log"]:
+for key in ["portfolio", "sales_last_scan", "couplings_log", "rooms_log"]:
     if key not in st.session_state:
         st.session_state[key] = []
 
+init_logs("trade_log", "inputs_log")
+
 # ==================================================
 # PORTFOLIO HELPERS
 # ==================================================
@@ -69,8 +73,10 @@ def upsert(ticker: str, qty_delta: float, px: float):
 
     st.session_state.portfolio = df.to_dict("records")
 
+TRADE_COLS = ["Timestamp", "Action", "Ticker", "Qty", "Price", "Reason"]
+
 def log_trade(action, ticker, qty, px, reason):
-    st.session_state.trade_log.insert(0, {
+    st.session_state.trade_log.appendleft({
         "Timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         "Action": action,
         "Ticker": ticker.upper(),
@@ -82,46 +88,45 @@ def log_trade(action, ticker, qty, px, reason):
 # ==================================================
 # COUPLING + NEWS SCORING
 # ==================================================
-def coupling_score_for_ticker(ticker: str):
+COUPLING_WEIGHTS = {"FULLY_COUPLED": 2.0, "STRONGLY_COUPLED": 1.5, "POTENTIAL": 0.5}
+
+def coupling_scores():
     """
-    Returns: (score_float, label)
+    Coupling score per ticker, folded from couplings_log in one pass.
     FULLY_COUPLED = 2.0, STRONGLY_COUPLED = 1.5, POTENTIAL = 0.5
     """
-    t = ticker.upper().strip()
-    score = 0.0
-
+    scores = Counter()
     for c in st.session_state.couplings_log:
+        w = COUPLING_WEIGHTS.get((c.get("Strength") or "").upper(), 0.0)
         a = (c.get("Ticker_A") or "").upper().strip()
         b = (c.get("Ticker_B") or "").upper().strip()
-        if t not in [a, b]:
-            continue
-        strength = (c.get("Strength") or "").upper()
-        if strength == "FULLY_COUPLED":
-            score += 2.0
-        elif strength == "STRONGLY_COUPLED":
-            score += 1.5
-        elif strength == "POTENTIAL":
-            score += 0.5
+        # A ticker coupled to itself still scores the coupling once
+        for t in {a, b}:
+            scores[t] += w
+    return scores
 
+def coupling_label(score: float):
     if score >= 4.0:
-        return score, "HEAVY"
+        return "HEAVY"
     if score >= 2.0:
-        return score, "STRONG"
+        return "STRONG"
     if score >= 0.5:
-        return score, "LIGHT"
-    return score, "NONE"
+        return "LIGHT"
+    return "NONE"
 
-def news_count_for_ticker(ticker: str, window: int = 200):
+def recent_news_counts(window: int = 200):
     """
-    Counts recent NEWS inputs in the last 'window' inputs_log rows.
+    NEWS inputs per ticker over the last 'window' inputs_log rows.
+    One pass over just those rows serves every ticker in the plan.
     """
-    t = ticker.upper().strip()
-    recent = st.session_state.inputs_log[:window]
-    return sum(1 for x in recent if (x.get("Input_Type") == "SALES_NEWS" and (x.get("Ticker","").upper().strip() == t)))
+    recent = islice(st.session_state.inputs_log, window)
+    return Counter(
+        x.get("Ticker","").upper().strip()
+        for x in recent if x.get("Input_Type") == "SALES_NEWS"
+    )
 
-def in_house(ticker: str):
-    t = ticker.upper().strip()
-    return any((r.get("Ticker","").upper().strip() == t) for r in st.session_state.rooms_log)
+def in_house_tickers():
+    return {r.get("Ticker","").upper().strip() for r in st.session_state.rooms_log}
 
 # ==================================================
 # DECISION ENGINE (MODE B)
@@ -137,6 +142,11 @@ def build_action_plan():
     if not scan:
         return pd.DataFrame()
 
+    # Per-ticker lookups built once, not rescanned for every scan row
+    news_counts = recent_news_counts()
+    cscores = coupling_scores()
+    housed = in_house_tickers()
+
     plan = []
     for r in scan:
         ticker = (r.get("Ticker") or "").upper().strip()
@@ -144,8 +154,8 @@ def build_action_plan():
             continue
 
         # Must be ticker-resolved and in-house preferred (but not required)
-        # If you want hard enforcement, flip this to "continue" when not in_house()
-        in_house_flag = in_house(ticker)
+        # If you want hard enforcement, flip this to "continue" when not in house
+        in_house_flag = ticker in housed
 
         signal = (r.get("Signal") or "WAIT").upper()
         rise = float(r.get("RiseScore_14d", 0.0) or 0.0)
@@ -156,8 +166,9 @@ def build_action_plan():
         bull_buy = bool(r.get("Bullseye_BUY", False))
         bull_sell = bool(r.get("Bullseye_SELL", False))
 
-        cscore, clabel = coupling_score_for_ticker(ticker)
-        ncount = news_count_for_ticker(ticker)
+        cscore = cscores.get(ticker, 0.0)
+        clabel = coupling_label(cscore)
+        ncount = news_counts[ticker]
 
         # Trigger condition (Mode B)
         coupled_strong = cscore >= 2.0
@@ -345,24 +356,31 @@ st.markdown("---")
 # ==================================================
 # MANUAL ENTRY
 # ==================================================
-st.subheader("➕ Manual Add / Adjust")
-a,b,c,d = st.columns([1,1,1,2])
-with a:
-    t = st.text_input("Ticker", "").upper().strip()
-with b:
-    qty = st.number_input("Qty (+buy / -sell)", value=0.0, step=1.0)
-with c:
-    px = st.number_input("Price", value=0.0, step=0.01)
-with d:
-    reason = st.text_input("Reason", "Manual")
-
-if st.button("Apply Manual Change"):
-    if not t or qty == 0 or px <= 0:
-        st.warning("Enter Ticker, non-zero Qty, Price > 0.")
-    else:
-        upsert(t, qty, px)
-        log_trade("BUY" if qty > 0 else "SELL", t, qty, px, reason)
-        st.success("Portfolio updated.")
+@st.fragment
+def manual_entry():
+    # Typing here reruns only this block, not the plan, prices and charts;
+    # a successful change triggers one full rerun to refresh them.
+    st.subheader("➕ Manual Add / Adjust")
+    a,b,c,d = st.columns([1,1,1,2])
+    with a:
+        t = st.text_input("Ticker", "").upper().strip()
+    with b:
+        qty = st.number_input("Qty (+buy / -sell)", value=0.0, step=1.0)
+    with c:
+        px = st.number_input("Price", value=0.0, step=0.01)
+    with d:
+        reason = st.text_input("Reason", "Manual")
+
+    if st.button("Apply Manual Change"):
+        if not t or qty == 0 or px <= 0:
+            st.warning("Enter Ticker, non-zero Qty, Price > 0.")
+        else:
+            upsert(t, qty, px)
+            log_trade("BUY" if qty > 0 else "SELL", t, qty, px, reason)
+            st.toast("Portfolio updated.")
+            st.rerun()
+
+manual_entry()
 
 st.markdown("---")
 
@@ -390,13 +408,13 @@ else:
     m3.metric("Unrealized PnL", f"{df['Unreal_PnL'].sum(skipna=True):,.2f}")
 
     st.subheader("📈 Visuals")
-    fig1, ax1 = plt.subplots(figsize=(8,3))
+    fig1, ax1 = session_figure("value_fig", (8,3))
     ax1.bar(df["Ticker"], df["Market_Value"])
     ax1.set_title("Market Value by Ticker")
     ax1.grid(True, alpha=0.2)
     st.pyplot(fig1)
 
-    fig2, ax2 = plt.subplots(figsize=(8,3))
+    fig2, ax2 = session_figure("pnl_fig", (8,3))
     ax2.bar(df["Ticker"], df["Unreal_PnL"])
     ax2.set_title("Unrealized PnL by Ticker")
     ax2.grid(True, alpha=0.2)
@@ -409,7 +427,10 @@ st.markdown("---")
 # ==================================================
 st.subheader("🧾 Trade Log")
 if st.session_state.trade_log:
-    st.dataframe(pd.DataFrame(st.session_state.trade_log), use_container_width=True)
+    st.dataframe(
+        pd.DataFrame.from_records(list(st.session_state.trade_log), columns=TRADE_COLS),
+        use_container_width=True,
+    )
 else:
     st.caption("No trades logged yet.")
 
@@ -1,5 +1,7 @@
+import re
 import pandas as pd
 import numpy as np
+import streamlit as st
 from scipy.stats import entropy
 import yfinance as yf
 from datetime import datetime, timedelta
@@ -14,6 +16,9 @@ NEWS_KEYWORDS = [
     "ceo", "cfo", "board", "executive", "resign", "appointed"
 ]
 
+# One compiled alternation: a single scan answers "any keyword present?"
+_NEWS_RE = re.compile("|".join(map(re.escape, NEWS_KEYWORDS)), re.IGNORECASE)
+
 NEGATIVE_WORDS = {
     "miss", "cut", "downgrade", "loss", "decline", "drop", "fall",
     "investigation", "lawsuit", "fine", "probe", "recall", "delay",
@@ -39,14 +44,20 @@ def classify_news_sentiment(text: str) -> str:
     return "NEUTRAL"
 
 
+@st.cache_data(ttl=120, show_spinner=False)
+def _fetch_news(ticker: str):
+    # Raw yfinance news, shared across reruns for two minutes.
+    # Failures raise and are therefore never cached.
+    return yf.Ticker(ticker).news or []
+
+
 def safe_news(ticker: str, limit: int = 8):
     """
     Returns ONLY relevant news items for this ticker.
     Output: list[{ticker,title,sentiment,publisher,link}]
     """
     try:
-        tk = yf.Ticker(ticker)
-        raw = tk.news or []
+        raw = _fetch_news(ticker)
     except Exception:
         return []
 
@@ -57,7 +68,7 @@ def safe_news(ticker: str, limit: int = 8):
         text = f"{title} {summary}"
 
         # Strict relevance filter
-        if not any(k in text.lower() for k in NEWS_KEYWORDS):
+        if not _NEWS_RE.search(text):
             continue
 
         relevant.append({
@@ -102,21 +113,51 @@ def apply_news_filter(sled_signal: str, news_items: list):
 # ==================================================
 # YFINANCE SAFE HISTORY
 # ==================================================
+def _clean_history(df, ticker: str):
+    if df is None or df.empty:
+        raise ValueError(f"no history for {ticker}")
+    # fix multiindex columns
+    if isinstance(df.columns, pd.MultiIndex):
+        try:
+            df.columns = df.columns.droplevel(1)
+        except Exception:
+            df.columns = df.columns.get_level_values(0)
+    df = df.loc[:, ~df.columns.duplicated()]
+    if "Close" not in df.columns:
+        raise ValueError(f"no Close column for {ticker}")
+    return df
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _fetch_history(ticker: str, period: str):
+    # Cleaned price history, cached per (ticker, period) for ten minutes.
+    # Callers get their own copy, so adding columns to it is safe.
+    # Empty or unusable downloads raise, so they are retried next time.
+    df = yf.download(ticker, period=period, progress=False, auto_adjust=True)
+    return _clean_history(df, ticker)
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _fetch_history_bulk(tickers: tuple, period: str):
+    # One batched download for many tickers; yfinance fans the requests
+    # out itself. Returns {ticker: cleaned history} for the usable ones.
+    raw = yf.download(
+        list(tickers), period=period, progress=False, auto_adjust=True,
+        group_by="ticker", threads=True,
+    )
+    out = {}
+    for t in tickers:
+        try:
+            # Dates are the union across tickers; drop the rows this one lacks
+            out[t] = _clean_history(raw[t].dropna(how="all"), t)
+        except Exception:
+            continue
+    return out
+
+
 def safe_history(ticker: str, period: str = "6mo"):
     try:
-        df = yf.download(ticker, period=period, progress=False, auto_adjust=True)
-        if df is None or df.empty:
-            return None
-        # fix multiindex columns
-        if isinstance(df.columns, pd.MultiIndex):
-            try:
-                df.columns = df.columns.droplevel(1)
-            except Exception:
-                df.columns = df.columns.get_level_values(0)
-        df = df.loc[:, ~df.columns.duplicated()]
-        if "Close" not in df.columns:
-            return None
-        return df
+        return _fetch_history(ticker, period)
     except Exception:
         return None
 
@@ -124,6 +165,46 @@ def safe_history(ticker: str, period: str = "6mo"):
 # ==================================================
 # SLED ENGINE
 # ==================================================
+def rolling_entropy(values, window: int, bins: int):
+    """
+    Shannon entropy (base 2) of a `bins`-bin histogram over each
+    trailing window, for all windows at once. Binning follows
+    np.histogram exactly; windows holding NaN give NaN, as do the
+    first window-1 positions.
+    """
+    x = np.asarray(values, dtype=np.float64)
+    out = np.full(len(x), np.nan)
+    if len(x) < window:
+        return out
+
+    W = np.lib.stride_tricks.sliding_window_view(x, window)
+    # Windows holding NaN are binned as zeros, then blanked at the end
+    gaps = np.isnan(W).any(axis=1)
+    if gaps.any():
+        W = np.where(gaps[:, None], 0.0, W)
+    lo, hi = W.min(axis=1), W.max(axis=1)
+    flat = lo == hi
+    # np.histogram widens a zero-width range by 0.5 either side
+    lo = np.where(flat, lo - 0.5, lo)
+    hi = np.where(flat, hi + 0.5, hi)
+
+    # Same bin assignment (and edge corrections) as np.histogram
+    edges = np.linspace(lo, hi, bins + 1, axis=1)
+    idx = ((W - lo[:, None]) * (bins / (hi - lo))[:, None]).astype(np.intp)
+    idx[idx == bins] -= 1
+    rows = np.arange(len(W))[:, None]
+    idx -= W < edges[rows, idx]
+    idx += (W >= edges[rows, idx + 1]) & (idx != bins - 1)
+
+    counts = np.zeros((len(W), bins))
+    np.add.at(counts, (np.broadcast_to(rows, idx.shape), idx), 1)
+    ent = entropy(counts, base=2, axis=1)
+
+    ent[gaps] = np.nan
+    out[window - 1:] = ent
+    return out
+
+
 class SLEDEngine:
     def __init__(self, window=20, lookback=100, entropy_bins=10):
         self.window = window
@@ -151,23 +232,19 @@ class SLEDEngine:
             # Flow (Sigma) entropy
             has_vol = ("Volume" in df.columns) and (df["Volume"].sum() > 0)
 
-            def get_ent(s):
-                if len(s) < self.window:
-                    return np.nan
-                h, _ = np.histogram(s, bins=self.entropy_bins)
-                if h.sum() == 0:
-                    return 0.0
-                p = h / h.sum()
-                p = p[p > 0]
-                return entropy(p, base=2)
-
             if has_vol:
                 vol = df["Volume"]
                 if isinstance(vol, pd.DataFrame):
                     vol = vol.iloc[:, 0]
-                df["Sigma"] = vol.rolling(self.window).apply(get_ent)
+                src = vol
+                scale = 1.0
             else:
-                df["Sigma"] = df["Log_Return"].rolling(self.window).apply(get_ent) * 1.5
+                src = df["Log_Return"]
+                scale = 1.5
+            # All windows in one vectorised pass (no per-window callback)
+            df["Sigma"] = rolling_entropy(
+                src.to_numpy(dtype=np.float64), self.window, self.entropy_bins
+            ) * scale
 
             # Gate
             df["Gate"] = (1 - df["Z_Trap"]) * df["Sigma"]
@@ -203,6 +280,7 @@ class SLEDEngine:
 
         price = float(last.get("Close", np.nan))
         z = float(last.get("Z_Trap", np.nan))
+        sigma = float(last.get("Sigma", np.nan))
         gate = float(last.get("Gate", np.nan))
         rise = float(last.get("RiseScore_14d", 0.0))
 
@@ -220,8 +298,59 @@ class SLEDEngine:
             "Price": round(price, 4) if np.isfinite(price) else np.nan,
             "Signal": signal,
             "Z_Trap": round(z, 4) if np.isfinite(z) else np.nan,
+            "Sigma": round(sigma, 4) if np.isfinite(sigma) else np.nan,
             "Gate": round(gate, 4) if np.isfinite(gate) else np.nan,
             "RiseScore_14d": round(rise, 4),
             "Bullseye_BUY": bool(bull_buy),
             "Bullseye_SELL": bool(bull_sell),
-        }
\ No newline at end of file
+        }
+
+# ==================================================
+# CACHED SCAN
+# ==================================================
+@st.cache_data(ttl=600, show_spinner=False)
+def _sled_summary(ticker: str, period: str, window: int, lookback: int, entropy_bins: int):
+    # Keyed on the engine settings rather than the engine object, and
+    # on the same ten-minute window as the history it is computed from.
+    engine = SLEDEngine(window=window, lookback=lookback, entropy_bins=entropy_bins)
+    return engine.summarize(engine.calculate(_fetch_history(ticker, period)))
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _sled_summaries(tickers: tuple, period: str, window: int, lookback: int, entropy_bins: int):
+    # Batched counterpart of _sled_summary: {ticker: summary} for every
+    # ticker the bulk download and the engine could handle.
+    engine = SLEDEngine(window=window, lookback=lookback, entropy_bins=entropy_bins)
+    out = {}
+    for t, df in _fetch_history_bulk(tickers, period).items():
+        try:
+            out[t] = engine.summarize(engine.calculate(df))
+        except Exception:
+            continue
+    return out
+
+
+def safe_summaries(tickers, period: str = "6mo", engine: SLEDEngine = None):
+    """
+    SLED summaries for many tickers from one batched download, in ticker
+    order, with None where a ticker is missing from the batch.
+    """
+    engine = engine or SLEDEngine()
+    tickers = tuple(tickers)
+    try:
+        found = _sled_summaries(tickers, period, engine.window, engine.lookback, engine.entropy_bins)
+    except Exception:
+        found = {}
+    return [found.get(t) for t in tickers]
+
+
+def safe_summary(ticker: str, period: str = "6mo", engine: SLEDEngine = None):
+    """
+    SLED summary for one ticker (see SLEDEngine.summarize), or None.
+    Reruns within the cache window skip both download and calculation.
+    """
+    engine = engine or SLEDEngine()
+    try:
+        return _sled_summary(ticker, period, engine.window, engine.lookback, engine.entropy_bins)
+    except Exception:
+        return None
@@ -1,11 +1,13 @@
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
 from scipy.ndimage import label
 
 from core.square import Square
 from core.persistence import Persistence
-from core.sandys_law import compute_Z, compute_Sigma, detect_RP
+from core.basin_memory import (
+    BasinMemory, BIRTH, SURVIVE, DIE, empty_annotations
+)
+from core.sandys_law import compute_frame, detect_RP
 
 # =====================================================
 # SESSION STATE
@@ -15,11 +17,11 @@ if "square" not in st.session_state:
     st.session_state.square = None
     st.session_state.persist = None
     st.session_state.prev = None
+    st.session_state.snapshot = None
     st.session_state.frame = 0
 
 if "basin_memory" not in st.session_state:
-    st.session_state.basin_memory = {}
-    st.session_state.next_id = 0
+    st.session_state.basin_memory = BasinMemory()
 
 # =====================================================
 # Z-BASIN EXTRACTION
@@ -28,21 +30,94 @@ if "basin_memory" not in st.session_state:
 def extract_z_basins(Z, z_thresh, min_size):
     """
     Extract connected Z-basins above threshold and filter by size.
-    Returns list of basins, each basin is list of (row, col).
+    Returns (basins, centroids): list of (n, 2) int16 arrays of (row, col)
+    and their (K, 2) centroids.
     """
     mask = Z >= z_thresh
     labeled, n = label(mask)
 
-    basins = []
-    for i in range(1, n + 1):
-        coords = np.argwhere(labeled == i)
-        if len(coords) >= min_size:
-            basins.append([tuple(p) for p in coords])
-    return basins
+    # Component areas in one counting pass; small basins are dropped
+    # before any of their cells are touched
+    flat = labeled.ravel()
+    sizes = np.bincount(flat, minlength=n + 1)
+    keep = sizes >= min_size
+    keep[0] = False
+    sizes = sizes[keep]
+
+    # Group kept cells by label with one stable sort instead of
+    # one full-grid scan per label
+    cells = np.flatnonzero(keep[flat])
+    cells = cells[np.argsort(flat[cells], kind="stable")]
+    bounds = np.zeros(len(sizes) + 1, dtype=np.intp)
+    np.cumsum(sizes, out=bounds[1:])
+
+    rc = np.column_stack(np.divmod(cells, labeled.shape[1]))
+    coords = rc.astype(np.int16)
+
+    # All centroids in one reduceat pass
+    if len(sizes):
+        centroids = np.add.reduceat(rc.astype(np.float64), bounds[:-1]) / sizes[:, None]
+    else:
+        centroids = np.empty((0, 2))
+
+    basins = [coords[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
+    return basins, centroids
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def analyse_fields(grid, prev, pmap, s_thresh):
+    """
+    Z, Σ and reaction points for the fresh world, cached on array
+    contents so UI-only reruns before the first step reuse them.
+    Stepped frames never repeat (the world is noisy), so advance_world
+    computes its fields directly.
+    """
+    return compute_frame(grid, prev, pmap, z_thresh=0.0, s_thresh=s_thresh)
+
+def advance_world(square, persist, prev, memory, square_steps,
+                  z_thresh, min_size, s_thresh, match_dist):
+    """
+    Evolve the world by one frame and return its snapshot.
+    The render path only ever reads snapshots, never the live world.
+    """
+    for _ in range(square_steps):
+        grid = square.step()
+        pmap = persist.update(grid)
+
+    Z, Sigma, RP = compute_frame(grid, prev, pmap, z_thresh=0.0, s_thresh=s_thresh)
+    basins, centroids = extract_z_basins(Z, z_thresh, min_size)
 
-def centroid(points):
-    pts = np.array(points)
-    return np.mean(pts, axis=0)
+    # --- Z-BASIN OBJECTS WITH SCALE ---
+    annotations = memory.update(basins, centroids, match_dist)
+
+    # prev is allocated once per world; refresh it in place
+    np.copyto(prev, grid)
+
+    return {
+        "Z": Z,
+        "Sigma": Sigma,
+        "RP": RP,
+        "s_thresh": s_thresh,
+        "annotations": annotations,
+    }
+
+@st.cache_resource
+def get_lut(cmap):
+    """
+    (256, 4) uint8 RGBA lookup table for a matplotlib colormap.
+    """
+    from matplotlib import colormaps
+    return colormaps[cmap](np.arange(256), bytes=True)
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def colorize(field, cmap):
+    """
+    Min-max normalise a 2-D field and map it through the colormap LUT
+    to uint8 RGBA, ready for st.image. Cached on the field contents.
+    """
+    lo, hi = field.min(), field.max()
+    scale = 256 / (hi - lo) if hi > lo else 0.0
+    idx = np.minimum((field - lo) * scale, 255).astype(np.uint8)
+    return get_lut(cmap)[idx]
 
 # =====================================================
 # APP CONFIG
@@ -92,8 +167,8 @@ if st.sidebar.button("Reset WORLD + MEMORY"):
     st.session_state.square = None
     st.session_state.persist = None
     st.session_state.prev = None
-    st.session_state.basin_memory = {}
-    st.session_state.next_id = 0
+    st.session_state.snapshot = None
+    st.session_state.basin_memory = BasinMemory()
     st.session_state.frame = 0
     st.sidebar.success("World and memory reset")
 
@@ -105,12 +180,16 @@ if st.session_state.square is None or st.session_state.square.size != size:
     st.session_state.square = Square(size=size)
     st.session_state.persist = Persistence(size)
     st.session_state.prev = st.session_state.square.grid.copy()
+    st.session_state.snapshot = None
+    # Remembered objects belong to the old geometry
+    st.session_state.basin_memory = BasinMemory()
 
 square = st.session_state.square
 persist = st.session_state.persist
 prev = st.session_state.prev
+memory = st.session_state.basin_memory
 
-annotations = []
+annotations = empty_annotations()
 
 # =====================================================
 # ADVANCE WORLD
@@ -118,123 +197,82 @@ annotations = []
 
 if advance:
     st.session_state.frame += 1
+    st.session_state.snapshot = advance_world(
+        square, persist, prev, memory, square_steps,
+        z_basin_thresh, min_basin_size, s_thresh, match_dist
+    )
 
-    for _ in range(square_steps):
-        grid = square.step()
-        pmap = persist.update(grid)
-
-    Z = compute_Z(grid, pmap)
-    Sigma = compute_Sigma(grid, prev)
-
-    # --- Z-BASIN OBJECTS WITH SCALE ---
-    basins = extract_z_basins(Z, z_basin_thresh, min_basin_size)
-
-    new_memory = {}
-    used_prev = set()
-
-    for basin in basins:
-        c = centroid(basin)
-
-        best_id = None
-        best_dist = None
-
-        for obj_id, obj in st.session_state.basin_memory.items():
-            d = np.linalg.norm(c - obj["centroid"])
-            if d <= match_dist and (best_dist is None or d < best_dist):
-                best_id = obj_id
-                best_dist = d
-
-        if best_id is not None:
-            # SURVIVE
-            new_memory[best_id] = {
-                "centroid": c,
-                "points": basin,
-                "age": st.session_state.basin_memory[best_id]["age"] + 1
-            }
-            used_prev.add(best_id)
-            annotations.append(("survive", basin))
-        else:
-            # BIRTH
-            obj_id = st.session_state.next_id
-            st.session_state.next_id += 1
-            new_memory[obj_id] = {
-                "centroid": c,
-                "points": basin,
-                "age": 1
-            }
-            annotations.append(("birth", basin))
-
-    # DEATHS
-    for obj_id, obj in st.session_state.basin_memory.items():
-        if obj_id not in used_prev:
-            annotations.append(("die", obj["points"]))
-
-    st.session_state.basin_memory = new_memory
-    st.session_state.prev = grid.copy()
+grid = square.grid
+snap = st.session_state.snapshot
 
+if snap is None:
+    # Fresh world: analyse the initial grid once (cached)
+    Z, Sigma, RP = analyse_fields(grid, prev, persist.map, s_thresh)
 else:
-    grid = square.grid
-    Z = compute_Z(grid, persist.update(grid))
-    Sigma = compute_Sigma(grid, prev)
-
-# =====================================================
-# REACTION POINTS (ATTENTION ONLY)
-# =====================================================
-
-RP = detect_RP(Z, Sigma, z_thresh=0.0, s_thresh=s_thresh)
-RP_coords = list(zip(RP[0], RP[1]))
+    # Reuse the last frame; re-threshold RP only when the Σ slider moved
+    Z, Sigma = snap["Z"], snap["Sigma"]
+    annotations = snap["annotations"]
+    if snap["s_thresh"] != s_thresh:
+        snap["RP"] = detect_RP(Z, Sigma, z_thresh=0.0, s_thresh=s_thresh)
+        snap["s_thresh"] = s_thresh
+    RP = snap["RP"]
 
 # =====================================================
 # VISUALS
 # =====================================================
 
-col1, col2, col3 = st.columns(3)
-
-with col1:
-    st.subheader("Square")
-    fig, ax = plt.subplots()
-    ax.imshow(grid, cmap="gray")
-    ax.axis("off")
-    st.pyplot(fig)
-
-with col2:
-    st.subheader("Z (Structure)")
-    fig, ax = plt.subplots()
-    ax.imshow(Z, cmap="inferno")
-    ax.axis("off")
-    st.pyplot(fig)
-
-with col3:
-    st.subheader("Σ (Change)")
-    fig, ax = plt.subplots()
-    ax.imshow(Sigma, cmap="viridis")
-    ax.axis("off")
-    st.pyplot(fig)
+# All three panels go out as one image element
+st.image(
+    [
+        colorize(grid, "gray"),
+        colorize(Z, "inferno"),
+        colorize(Sigma, "viridis"),
+    ],
+    caption=["Square", "Z (Structure)", "Σ (Change)"],
+    width=360,
+)
 
 # =====================================================
 # OBJECT VIEW
 # =====================================================
 
+@st.fragment
+def render_objects(grid, annotations, RP):
+    """
+    Object overlay. Its view toggles rerun only this fragment,
+    never the simulation above.
+    """
+    c1, c2 = st.columns(2)
+    show_deaths = c1.checkbox("Show deaths", value=True)
+    show_attention = c2.checkbox("Show attention", value=True)
+
+    # Paint straight into a uint8 RGBA copy of the grid heatmap
+    canvas = colorize(grid, "gray")
+
+    colors = {BIRTH: (0, 255, 0), SURVIVE: (0, 255, 255), DIE: (255, 0, 0)}
+    if not show_deaths:
+        del colors[DIE]
+
+    states, offsets, pts = annotations
+    point_state = np.repeat(states, np.diff(offsets))
+    for state, color in colors.items():
+        sel = pts[point_state == state]
+        canvas[sel[:, 0], sel[:, 1], :3] = color
+
+    # Attention: blend white over reaction points; RP is (rows, cols)
+    rows, cols = RP
+    if show_attention and len(rows):
+        canvas[rows, cols, :3] = canvas[rows, cols, :3] * 0.65 + 255 * 0.35
+
+    st.image(
+        canvas,
+        caption="Green=Birth • Cyan=Survive • Red=Death • White=Attention",
+        width=480,
+    )
+
 st.divider()
 st.subheader(f"Z-Basin Objects — Frame {st.session_state.frame}")
-
-fig, ax = plt.subplots()
-ax.imshow(grid, cmap="gray")
-
-colors = {"birth": "lime", "survive": "cyan", "die": "red"}
-
-for state, basin in annotations:
-    pts = np.array(basin)
-    ax.scatter(pts[:,1], pts[:,0], c=colors[state], s=28, alpha=0.9)
-
-# Attention overlay
-if RP_coords:
-    rp = np.array(RP_coords)
-    ax.scatter(rp[:,1], rp[:,0], c="white", s=8, alpha=0.35)
-
-ax.set_title("Green=Birth • Cyan=Survive • Red=Death • White=Attention")
-ax.axis("off")
-st.pyplot(fig)
+render_objects(grid, annotations, RP)
 
 # =====================================================
 # SUMMARY
@@ -243,24 +281,24 @@ st.pyplot(fig)
 st.divider()
 st.subheader("System Summary")
 
-births = sum(1 for s,_ in annotations if s == "birth")
-survive = sum(1 for s,_ in annotations if s == "survive")
-deaths = sum(1 for s,_ in annotations if s == "die")
-
-ages = [obj["age"] for obj in st.session_state.basin_memory.values()]
+counts = np.bincount(annotations[0], minlength=3).tolist()
+births, survive, deaths = counts[BIRTH], counts[SURVIVE], counts[DIE]
 
 colA, colB, colC = st.columns(3)
 
 with colA:
     st.metric("Frame", st.session_state.frame)
-    st.metric("Active Objects", len(ages))
+    st.metric("Active Objects", len(memory))
 
 with colB:
     st.metric("Births", births)
     st.metric("Deaths", deaths)
 
 with colC:
-    st.write("Object ages:", ages if ages else "—")
+    st.metric("Oldest Object Age", memory.max_age)
+    # Built only on request; an expander body would run on every rerun
+    if st.toggle("Show object ages"):
+        st.write(memory.ages.tolist() if len(memory) else "—")
 
 # =====================================================
 # FOOTER
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from core.proto_objects import cluster_reaction_points
+
+# ==================================================
+# REFERENCE: the original grow-loop clustering
+# ==================================================
+def _reference_clusters(RP_coords, eps=2.5, min_samples=3):
+    if len(RP_coords) == 0:
+        return []
+
+    RP = np.array(RP_coords)
+    used = np.zeros(len(RP), dtype=bool)
+    clusters = []
+
+    for i in range(len(RP)):
+        if used[i]:
+            continue
+        dists = np.linalg.norm(RP - RP[i], axis=1)
+        neighbours = np.where(dists <= eps)[0]
+        if len(neighbours) < min_samples:
+            continue
+
+        cluster = set(neighbours.tolist())
+        changed = True
+        while changed:
+            changed = False
+            for idx in list(cluster):
+                dists = np.linalg.norm(RP - RP[idx], axis=1)
+                new = set(np.where(dists <= eps)[0])
+                if len(new) >= min_samples and not new.issubset(cluster):
+                    cluster |= new
+                    changed = True
+
+        cluster = list(cluster)
+        used[cluster] = True
+        clusters.append(RP[cluster])
+
+    return clusters
+
+def _unpack(offsets, rows, cols):
+    return [
+        np.column_stack((rows[s:e], cols[s:e]))
+        for s, e in zip(offsets[:-1], offsets[1:])
+    ]
+
+def _as_sets(clusters):
+    return [{tuple(p) for p in c.tolist()} for c in clusters]
+
+# ==================================================
+# TESTS
+# ==================================================
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("n", [5, 40, 200])
+def test_matches_reference(seed, n):
+    rng = np.random.default_rng(seed)
+    RP = np.unique(rng.integers(0, 32, size=(n, 2)), axis=0)
+
+    got = _unpack(*cluster_reaction_points(RP))
+    want = _reference_clusters(RP)
+
+    # Same proto-objects, in the same order, with the same members
+    assert _as_sets(got) == _as_sets(want)
+    assert [len(c) for c in got] == [len(c) for c in want]
+
+def test_empty_input():
+    offsets, rows, cols = cluster_reaction_points(np.empty((0, 2), dtype=int))
+    assert offsets.tolist() == [0]
+    assert len(rows) == len(cols) == 0
+
+def test_no_core_points():
+    RP = np.array([[0, 0], [10, 10], [20, 20]])
+    offsets, rows, cols = cluster_reaction_points(RP)
+    assert offsets.tolist() == [0]
+    assert _reference_clusters(RP) == []
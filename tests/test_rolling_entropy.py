@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import entropy
+
+from sled_core import rolling_entropy
+
+# ==================================================
+# REFERENCE: the original per-window rolling apply
+# ==================================================
+def _reference(values, window, bins):
+    def get_ent(s):
+        if len(s) < window:
+            return np.nan
+        h, _ = np.histogram(s, bins=bins)
+        if h.sum() == 0:
+            return 0.0
+        p = h / h.sum()
+        p = p[p > 0]
+        return entropy(p, base=2)
+
+    return pd.Series(values).rolling(window).apply(get_ent).to_numpy()
+
+def _check(values, window=20, bins=10):
+    got = rolling_entropy(values, window, bins)
+    want = _reference(values, window, bins)
+    np.testing.assert_array_equal(np.isnan(got), np.isnan(want))
+    np.testing.assert_allclose(got, want, rtol=0, atol=1e-12, equal_nan=True)
+
+# ==================================================
+# TESTS
+# ==================================================
+@pytest.mark.parametrize("seed", range(10))
+def test_random_returns(seed):
+    rng = np.random.default_rng(seed)
+    _check(rng.normal(0, 0.02, 300))
+
+@pytest.mark.parametrize("seed", range(10))
+def test_integer_volumes(seed):
+    # Many ties and values sitting exactly on bin edges
+    rng = np.random.default_rng(seed)
+    _check(rng.integers(0, 12, 300).astype(float), window=15, bins=6)
+
+def test_flat_windows():
+    x = np.concatenate([np.full(40, 3.0), np.linspace(0, 1, 30), np.zeros(25)])
+    _check(x)
+
+def test_nan_windows():
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=120)
+    x[0] = np.nan
+    x[50:53] = np.nan
+    x[-1] = np.nan
+    _check(x)
+
+def test_shorter_than_window():
+    got = rolling_entropy(np.arange(5.0), 20, 10)
+    assert np.isnan(got).all() and len(got) == 5
+
+@pytest.mark.parametrize("window, bins", [(2, 10), (20, 1), (7, 3)])
+def test_window_and_bin_sizes(window, bins):
+    rng = np.random.default_rng(1)
+    _check(rng.lognormal(12, 1, 200), window=window, bins=bins)